@@ -30,8 +30,7 @@ async def test_coordinator_queue_management(manager: ManagerClient):
     marks = [await log.mark() for log in logs]
     await manager.server_stop_gracefully(servers[3].server_id)
     await manager.server_stop_gracefully(servers[4].server_id)
-    await manager.server_not_sees_other_server(servers[0].ip_addr, servers[3].ip_addr)
-    await manager.server_not_sees_other_server(servers[0].ip_addr, servers[4].ip_addr)
+    await manager.server_not_sees_other_servers(servers[0].ip_addr, [servers[3].ip_addr, servers[4].ip_addr])
 
     inj = 'topology_coordinator_pause_before_processing_backlog'
     [await manager.api.enable_injection(s.ip_addr, inj, one_shot=True) for s in servers[:3]]
@@ -139,8 +139,7 @@ async def test_sync_point(manager: ManagerClient):
         await manager.server_stop_gracefully(node2.server_id)
         await manager.server_stop_gracefully(node3.server_id)
 
-        await manager.server_not_sees_other_server(node1.ip_addr, node2.ip_addr)
-        await manager.server_not_sees_other_server(node1.ip_addr, node3.ip_addr)
+        await manager.server_not_sees_other_servers(node1.ip_addr, [node2.ip_addr, node3.ip_addr])
 
         mutation_count = 5
         for primary_key in range(mutation_count):
@@ -120,10 +120,10 @@ async def test_raft_recovery_during_join(manager: ManagerClient):
     await manager.rolling_restart(live_servers, with_down=set_recovery_leader)
 
     logging.info(f'Removing {dead_servers}')
-    for i, being_removed in enumerate(dead_servers):
-        ignored = [dead_srv.ip_addr for dead_srv in dead_servers[i + 1:]]
-        initiator = live_servers[i % 2]
-        await manager.remove_node(initiator.server_id, being_removed.server_id, ignored)
+    await manager.remove_nodes([(
+        live_servers[i % 2].server_id, being_removed.server_id,
+        [dead_srv.ip_addr for dead_srv in dead_servers[i + 1:]],
+    ) for i, being_removed in enumerate(dead_servers)])
 
     logging.info(f'Unsetting the recovery_leader config option on {live_servers}')
     for srv in live_servers:
@@ -158,10 +158,10 @@ async def test_raft_recovery_user_data(manager: ManagerClient, remove_dead_nodes
                                 {{'class': 'NetworkTopologyStrategy', 'dc1': {rf}, 'dc2': {rf - i}}}""")
 
         logging.info(f'Removing {dead_servers}')
-        for i, being_removed in enumerate(dead_servers):
-            ignored = [dead_srv.ip_addr for dead_srv in dead_servers[i + 1:]]
-            initiator = live_servers[i]
-            await manager.remove_node(initiator.server_id, being_removed.server_id, ignored)
+        await manager.remove_nodes([(
+            live_servers[i].server_id, being_removed.server_id,
+            [dead_srv.ip_addr for dead_srv in dead_servers[i + 1:]],
+        ) for i, being_removed in enumerate(dead_servers)])
     else:
         logging.info(f'Replacing {dead_servers}')
         for i, being_replaced in enumerate(dead_servers):
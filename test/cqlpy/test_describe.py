@@ -7,12 +7,15 @@
 # Tests for server-side describe
 ###############################################################################
 
+import functools
 import itertools
 import uuid
+import weakref
 import pytest
 import random
 import re
 import textwrap
+import time
 from contextlib import ExitStack
 from .util import new_type, unique_name, new_test_table, new_test_keyspace, new_function, new_aggregate, \
     new_cql, keyspace_has_tablets, unique_name_prefix, new_session, new_user, new_materialized_view, \
@@ -21,6 +24,7 @@ from .conftest import has_tablets
 from .test_service_levels import MAX_USER_SERVICE_LEVELS
 from test.pylib.skip_types import skip_env
 from cassandra.protocol import InvalidRequest, Unauthorized
+from collections import Counter
 from collections.abc import Iterable
 from typing import Any
 
@@ -99,22 +103,33 @@ def is_create_index(create_statement: str) -> bool:
 # There are also single tests for DESC CLUSTER and DESC SCHEMA statements and also
 # for some corner cases.
 
+# A separate session, on which no `USE keyspace` statement is ever executed.
+# Listings (`DESC TABLES`, `DESC TYPES`, ...) depend on the USEd keyspace, so
+# tests checking them shouldn't run on the shared "cql" fixture. Opening a new
+# session with new_cql() for every such check is expensive (it connects to
+# every shard of every node), so all these tests share this one session.
+# Tests which do execute `USE` must still use new_cql().
+@pytest.fixture(scope="module")
+def cql_without_use(cql):
+    with new_cql(cql) as ncql:
+        yield ncql
+
 # Test `DESC {elements}` listing. Assert if all rows from `system_schema.{elements}`
-# are in describe result
+# are in describe result.
+# `cql` must be a session without `USE keyspace` statement executed before
+# (see cql_without_use).
 def assert_element_listing(cql, elements, name_column, name_f):
-    # Create new session to ensure no `USE keyspace` statement was executed before
-    with new_cql(cql) as ncql:
-        table_result = ncql.execute(f"SELECT keyspace_name, {name_column} FROM system_schema.{elements}")
-        desc_result = ncql.execute(f"DESC {elements}")
+    table_result = cql.execute(f"SELECT keyspace_name, {name_column} FROM system_schema.{elements}")
+    desc_result = cql.execute(f"DESC {elements}")
 
-        desc_listing = [(r.keyspace_name, r.name) for r in desc_result]
+    desc_listing = {(r.keyspace_name, r.name) for r in desc_result}
 
-        for row in table_result:
-            assert (maybe_quote(row.keyspace_name), maybe_quote(name_f(row))) in desc_listing
+    for row in table_result:
+        assert (maybe_quote(row.keyspace_name), maybe_quote(name_f(row))) in desc_listing
 
 # Test that `DESC KEYSPACES` contains all keyspaces
-def test_keyspaces(cql, test_keyspace):
-    assert_element_listing(cql, "keyspaces", "keyspace_name", lambda r: r.keyspace_name)
+def test_keyspaces(cql_without_use, test_keyspace):
+    assert_element_listing(cql_without_use, "keyspaces", "keyspace_name", lambda r: r.keyspace_name)
 
 # Test that even with a USE statement, `DESC KEYSPACES` still lists all the
 # keyspaces, not just the USEd keyspace. Reproduces issue #26334.
@@ -123,8 +138,8 @@ def test_keyspaces_with_use(cql, test_keyspace):
     # tests that we'll run later and use the same "cql" fixture.
     with new_cql(cql) as ncql:
         ncql.execute(f"USE {test_keyspace}")
-        # we can't use assert_element_listing because it currently undoes
-        # our "USE" by using new_cql itself...
+        # we can't use assert_element_listing because it expects a session
+        # without "USE" (cql_without_use)...
         desc_keyspaces = [x.keyspace_name for x in ncql.execute("DESC KEYSPACES")]
         expected_keyspaces = [x.keyspace_name for x in ncql.execute(f"SELECT keyspace_name FROM system_schema.keyspaces")]
         # Allow, like assert_element_listing(), for DESC KEYSPACES to contain
@@ -148,27 +163,27 @@ def test_tables_with_use(cql, test_keyspace):
             assert sorted(expected_tables) ==  sorted(desc_tables)
 
 # Test that `DESC TABLES` contains all tables
-def test_tables(cql, test_keyspace):
+def test_tables(cql, cql_without_use, test_keyspace):
     with new_test_table(cql, test_keyspace, "id int PRIMARY KEY"):
-        assert_element_listing(cql, "tables", "table_name", lambda r: r.table_name)
+        assert_element_listing(cql_without_use, "tables", "table_name", lambda r: r.table_name)
 
 # Test that `DESC TYPES` contains all user types
-def test_desc_types(cql, test_keyspace):
+def test_desc_types(cql, cql_without_use, test_keyspace):
     with new_random_type(cql, test_keyspace), new_random_type(cql, test_keyspace):
-        assert_element_listing(cql, "types", "type_name", lambda r: r.type_name)
+        assert_element_listing(cql_without_use, "types", "type_name", lambda r: r.type_name)
 
 # Test that `DESC FUNCTIONS` contains all user functions
-def test_desc_functions(scylla_only, cql, test_keyspace):
+def test_desc_functions(scylla_only, cql, cql_without_use, test_keyspace):
     fn_schema = "(val int)"
     fn_null = "RETURNS NULL ON NULL INPUT"
     fn_return = "RETURNS int"
     fn_language = "LANGUAGE lua"
     fn_body = "AS 'return -val'"
     with new_function(cql, test_keyspace, f"{fn_schema} {fn_null} {fn_return} {fn_language} {fn_body}"):
-        assert_element_listing(cql, "functions", "function_name", lambda r: r.function_name)
+        assert_element_listing(cql_without_use, "functions", "function_name", lambda r: r.function_name)
         
 # Test that `DESC AGGREGATES` contains all user aggregates
-def test_desc_aggregates(scylla_only, cql, test_keyspace):
+def test_desc_aggregates(scylla_only, cql, cql_without_use, test_keyspace):
     fn_schema = "(val1 int, val2 int)"
     fn_null = "RETURNS NULL ON NULL INPUT"
     fn_return = "RETURNS int"
@@ -178,109 +193,117 @@ def test_desc_aggregates(scylla_only, cql, test_keyspace):
     with new_function(cql, test_keyspace, f"{fn_schema} {fn_null} {fn_return} {fn_language} AS '{fn_body}'") as fn:
         agg_body = f"(int) SFUNC {fn} STYPE int INITCOND 0"
         with new_aggregate(cql, test_keyspace, agg_body):
-            assert_element_listing(cql, "aggregates", "aggregate_name", lambda r: r.aggregate_name)
+            assert_element_listing(cql_without_use, "aggregates", "aggregate_name", lambda r: r.aggregate_name)
+
+# Keyspaces registered in the list yielded by this fixture are dropped only
+# when all tests in this file finish. Dropping a keyspace is expensive, and
+# doing it at the end of every test which creates one adds up, so the drops
+# are deferred and issued concurrently.
+@pytest.fixture(scope="module")
+def keyspaces_to_drop(cql):
+    keyspaces = []
+    yield keyspaces
+    futures = [cql.execute_async(f"DROP KEYSPACE IF EXISTS {ks}") for ks in keyspaces]
+    for f in futures:
+        f.result()
+
+# Tests which only read the schema of a random table or type can share one
+# instead of creating their own, because every CREATE and DROP costs a round
+# of schema agreement. `shared_random_element(new_random_table)` returns a
+# random table, which is created on first use and dropped when all tests in
+# this file finish. The shared elements live in their own keyspace, so tests
+# which look at everything in `test_keyspace` don't see them. The element may
+# have been generated by an earlier test, so it doesn't depend on the seed of
+# the `random_seed` fixture. Instead, every element is generated with its own
+# seed, which is printed together with the element's description (like
+# `random_seed`, the state of random module is restored afterwards).
+@pytest.fixture(scope="module")
+def shared_random_element(cql, this_dc):
+    elements = {}
+    with new_test_keyspace(cql, "WITH REPLICATION = { 'class' : 'NetworkTopologyStrategy', '" + this_dc + "' : 1 }") as keyspace, \
+            ExitStack() as stack:
+        def get(new_random_element):
+            if new_random_element not in elements:
+                state = random.getstate()
+                seed = time.time()
+                random.seed(seed)
+                try:
+                    element = stack.enter_context(new_random_element(cql, keyspace))
+                finally:
+                    random.setstate(state)
+                kind = "TABLE" if new_random_element is new_random_table else "TYPE"
+                desc = cql.execute(f"DESC {kind} {element}").one().create_statement
+                print(f"Using seed {seed} for shared {element}:\n{desc}")
+                elements[new_random_element] = element
+            return elements[new_random_element]
+        yield get
 
 # Test that `DESC ONLY KEYSPACE {ks}` contains appropriate create statement for keyspace
 # This test compares the content of `system_schema.keyspaces` table.
-def test_desc_keyspace(cql, random_seed):
+def test_desc_keyspace(cql, keyspaces_to_drop, random_seed):
     with new_random_keyspace(cql) as ks:
         desc = cql.execute(f"DESC ONLY KEYSPACE {ks}")
         desc_stmt = desc.one().create_statement
 
         new_ks = unique_name()
-        new_desc_stmt = desc_stmt.replace(ks, new_ks)
+        new_desc_stmt = rename_element(desc_stmt, ks, new_ks)
+
+        keyspaces_to_drop.append(new_ks)
+        cql.execute(new_desc_stmt)
+        ks_rows = select_schema_rows(cql, "keyspaces", "durable_writes, replication",
+            "keyspace_name", [ks, new_ks])
+        assert ks_rows[ks] == ks_rows[new_ks]
 
-        try:
-            cql.execute(new_desc_stmt)
-            ks_row = cql.execute(f"""
-                SELECT durable_writes, replication
-                FROM system_schema.keyspaces
-                WHERE keyspace_name='{ks}'
-            """).one()
-            new_ks_row = cql.execute(f"""
-                SELECT durable_writes, replication
-                FROM system_schema.keyspaces
-                WHERE keyspace_name='{new_ks}'
-            """).one()
-            assert ks_row == new_ks_row
-        finally:
-            cql.execute(f"DROP KEYSPACE {new_ks}")
 # Test that `DESC ONLY KEYSPACE {ks}` contains appropriate create statement for keyspace
 # This test compares the content of `system_schema.scylla_keyspaces` table, thus the test
 # is `scylla_only`.
-def test_desc_scylla_keyspace(scylla_only, cql, random_seed):
+def test_desc_scylla_keyspace(scylla_only, cql, keyspaces_to_drop, random_seed):
     with new_random_keyspace(cql) as ks:
         desc = cql.execute(f"DESC ONLY KEYSPACE {ks}")
         desc_stmt = desc.one().create_statement
 
         new_ks = unique_name()
-        new_desc_stmt = desc_stmt.replace(ks, new_ks)
+        new_desc_stmt = rename_element(desc_stmt, ks, new_ks)
 
-        try:
-            cql.execute(new_desc_stmt)
-            ks_scylla_row = cql.execute(f"""
-                SELECT storage_options, storage_type
-                FROM system_schema.scylla_keyspaces
-                WHERE keyspace_name='{ks}'
-            """).one()
-            new_ks_scylla_row = cql.execute(f"""
-                SELECT storage_options, storage_type
-                FROM system_schema.scylla_keyspaces
-                WHERE keyspace_name='{new_ks}'
-            """).one()
-            assert ks_scylla_row == new_ks_scylla_row
-        finally:
-            cql.execute(f"DROP KEYSPACE {new_ks}")
+        keyspaces_to_drop.append(new_ks)
+        cql.execute(new_desc_stmt)
+        ks_scylla_rows = select_schema_rows(cql, "scylla_keyspaces", "storage_options, storage_type",
+            "keyspace_name", [ks, new_ks])
+        assert ks_scylla_rows[ks] == ks_scylla_rows[new_ks]
 
 # Test that `DESC TABLE {tbl}` contains appropriate create statement for table
 # This test compares the content of `system_schema.tables` and `system_schema.columns` tables.
-def test_desc_table(cql, test_keyspace, random_seed):
-    with new_random_table(cql, test_keyspace) as tbl:
-        desc = cql.execute(f"DESC TABLE {tbl}")
-        desc_stmt = desc.one().create_statement
+def test_desc_table(cql, shared_random_element, random_seed):
+    tbl = shared_random_element(new_random_table)
+    keyspace = get_keyspace(tbl)
+    desc = cql.execute(f"DESC TABLE {tbl}")
+    desc_stmt = desc.one().create_statement
 
-        new_tbl = f"{test_keyspace}.{unique_name()}"
-        new_desc_stmt = desc_stmt.replace(tbl, new_tbl)
+    old_name = get_name(tbl)
+    new_name = unique_name()
+    new_tbl = f"{keyspace}.{new_name}"
+    new_desc_stmt = rename_element(desc_stmt, tbl, new_tbl)
 
-        try:
-            cql.execute(new_desc_stmt)
-            tbl_row = cql.execute(f"""
-                SELECT keyspace_name, bloom_filter_fp_chance, caching,
-                comment, compaction, compression, crc_check_chance,
-                default_time_to_live, extensions,
-                flags, gc_grace_seconds, max_index_interval,
-                memtable_flush_period_in_ms, min_index_interval,
-                speculative_retry
-                FROM system_schema.tables
-                WHERE keyspace_name='{test_keyspace}' AND table_name='{get_name(tbl)}'
-            """).one()
-            new_tbl_row = cql.execute(f"""
-                SELECT keyspace_name, bloom_filter_fp_chance, caching,
-                comment, compaction, compression, crc_check_chance,
-                default_time_to_live, extensions,
-                flags, gc_grace_seconds, max_index_interval,
-                memtable_flush_period_in_ms, min_index_interval,
-                speculative_retry
-                FROM system_schema.tables
-                WHERE keyspace_name='{test_keyspace}' AND table_name='{get_name(new_tbl)}'
-            """).one()
-            assert tbl_row == new_tbl_row
-
-            col_rows = cql.execute(f"""
-                SELECT keyspace_name, column_name, clustering_order, column_name_bytes,
-                kind, position, type
-                FROM system_schema.columns
-                WHERE keyspace_name='{test_keyspace}' AND table_name='{get_name(tbl)}'
-            """)
-            new_col_rows = cql.execute(f"""
-                SELECT keyspace_name, column_name, clustering_order, column_name_bytes,
-                kind, position, type
-                FROM system_schema.columns
-                WHERE keyspace_name='{test_keyspace}' AND table_name='{get_name(new_tbl)}'
-            """)
-            assert col_rows == new_col_rows
-        finally:
-            cql.execute(f"DROP TABLE {new_tbl}")
+    try:
+        cql.execute(new_desc_stmt)
+        get_tbl_rows = select_schema_rows_async(cql, "tables", """
+            keyspace_name, bloom_filter_fp_chance, caching,
+            comment, compaction, compression, crc_check_chance,
+            default_time_to_live, extensions,
+            flags, gc_grace_seconds, max_index_interval,
+            memtable_flush_period_in_ms, min_index_interval,
+            speculative_retry
+        """, "table_name", [old_name, new_name], keyspace)
+        get_col_rows = select_schema_rows_async(cql, "columns", """
+            keyspace_name, column_name, clustering_order, column_name_bytes,
+            kind, position, type
+        """, "table_name", [old_name, new_name], keyspace)
+        tbl_rows, col_rows = get_tbl_rows(), get_col_rows()
+
+        assert tbl_rows[old_name] == tbl_rows[new_name]
+        assert col_rows[old_name] == col_rows[new_name]
+    finally:
+        cql.execute(f"DROP TABLE {new_tbl}")
 
 # This test compares the content of `system_schema.tables` and `system_schema.columns` tables
 # when providing tablet options to CREATE TABLE.
@@ -297,7 +320,7 @@ def test_desc_table_with_tablet_options(cql, test_keyspace, random_seed, skip_wi
 
         try:
             new_tbl = f"{test_keyspace}.{unique_name()}"
-            new_create_stmt = desc_create_stmt.replace(tbl, new_tbl)
+            new_create_stmt = rename_element(desc_create_stmt, tbl, new_tbl)
             cql.execute(new_create_stmt)
             new_desc_stmt = cql.execute(f"DESC TABLE {new_tbl}")
             new_desc_create_stmt = new_desc_stmt.one().create_statement
@@ -308,54 +331,44 @@ def test_desc_table_with_tablet_options(cql, test_keyspace, random_seed, skip_wi
 # Test that `DESC TABLE {tbl}` contains appropriate create statement for table
 # This test compares the content of `system_schema.scylla_tables` tables, thus the test
 # is `scylla_only`.
-def test_desc_scylla_table(scylla_only, cql, test_keyspace, random_seed):
-    with new_random_table(cql, test_keyspace) as tbl:
-        desc = cql.execute(f"DESC TABLE {tbl}")
-        desc_stmt = desc.one().create_statement
+def test_desc_scylla_table(scylla_only, cql, shared_random_element, random_seed):
+    tbl = shared_random_element(new_random_table)
+    keyspace = get_keyspace(tbl)
+    desc = cql.execute(f"DESC TABLE {tbl}")
+    desc_stmt = desc.one().create_statement
 
-        new_tbl = f"{test_keyspace}.{unique_name()}"
-        new_desc_stmt = desc_stmt.replace(tbl, new_tbl)
+    old_name = get_name(tbl)
+    new_name = unique_name()
+    new_tbl = f"{keyspace}.{new_name}"
+    new_desc_stmt = rename_element(desc_stmt, tbl, new_tbl)
 
-        try:
-            cql.execute(new_desc_stmt)
-            tbl_scylla_row = cql.execute(f"""
-                SELECT cdc, partitioner
-                FROM system_schema.scylla_tables
-                WHERE keyspace_name='{test_keyspace}' AND table_name='{get_name(tbl)}'
-            """).one()
-            new_tbl_scylla_row = cql.execute(f"""
-                SELECT cdc, partitioner
-                FROM system_schema.scylla_tables
-                WHERE keyspace_name='{test_keyspace}' AND table_name='{get_name(new_tbl)}'
-            """).one()
-            assert tbl_scylla_row == new_tbl_scylla_row
-        finally:
-            cql.execute(f"DROP TABLE {new_tbl}")
+    try:
+        cql.execute(new_desc_stmt)
+        tbl_scylla_rows = select_schema_rows(cql, "scylla_tables", "cdc, partitioner",
+            "table_name", [old_name, new_name], keyspace)
+        assert tbl_scylla_rows[old_name] == tbl_scylla_rows[new_name]
+    finally:
+        cql.execute(f"DROP TABLE {new_tbl}")
 
 # Test that `DESC TYPE {udt}` contains appropriate create statement for user-defined type
-def test_desc_type(cql, test_keyspace, random_seed):
-    with new_random_type(cql, test_keyspace) as udt:
-        desc = cql.execute(f"DESC TYPE {udt}")
-        desc_stmt = desc.one().create_statement
+def test_desc_type(cql, shared_random_element, random_seed):
+    udt = shared_random_element(new_random_type)
+    keyspace = get_keyspace(udt)
+    desc = cql.execute(f"DESC TYPE {udt}")
+    desc_stmt = desc.one().create_statement
 
-        new_udt = f"{test_keyspace}.{unique_name()}"
-        new_desc_stmt = desc_stmt.replace(udt, new_udt)
+    old_name = get_name(udt)
+    new_name = unique_name()
+    new_udt = f"{keyspace}.{new_name}"
+    new_desc_stmt = rename_element(desc_stmt, udt, new_udt)
 
-        try:
-            cql.execute(new_desc_stmt)
-            udt_row = cql.execute(f"""
-                SELECT keyspace_name, field_names, field_types
-                FROM system_schema.types
-                WHERE keyspace_name='{test_keyspace}' AND type_name='{get_name(udt)}'
-            """).one()
-            new_udt_row = cql.execute(f"""
-                SELECT keyspace_name, field_names, field_types
-                FROM system_schema.types
-                WHERE keyspace_name='{test_keyspace}' AND type_name='{get_name(new_udt)}'
-            """).one()
-            assert udt_row == new_udt_row
-        finally:
-            cql.execute(f"DROP TYPE {new_udt}")
+    try:
+        cql.execute(new_desc_stmt)
+        udt_rows = select_schema_rows(cql, "types", "keyspace_name, field_names, field_types",
+            "type_name", [old_name, new_name], keyspace)
+        assert udt_rows[old_name] == udt_rows[new_name]
+    finally:
+        cql.execute(f"DROP TYPE {new_udt}")
 
 # Test that `DESC FUNCTION {udf}` contains appropriate create statement for user-defined function
 # The test is `scylla_only` because Scylla's UDF is written in Lua, which is not supported by Cassandra
@@ -370,30 +383,20 @@ def test_desc_function(scylla_only, cql, test_keyspace, random_seed):
         desc_stmt = desc.one().create_statement
 
         new_fn = unique_name()
-        new_desc_stmt = desc_stmt.replace(fn, new_fn)
+        new_desc_stmt = rename_element(desc_stmt, fn, new_fn)
 
         try:
             cql.execute(new_desc_stmt)
-            fn_row = cql.execute(f"""
-                SELECT argument_types, argument_names, body, called_on_null_input, language, return_type
-                FROM system_schema.functions
-                WHERE keyspace_name='{test_keyspace}' AND function_name='{fn}'
-            """).one()
-            new_fn_row = cql.execute(f"""
-                SELECT argument_types, argument_names, body, called_on_null_input, language, return_type
-                FROM system_schema.functions
-                WHERE keyspace_name='{test_keyspace}' AND function_name='{new_fn}'
-            """).one()
-
-            # The columns are tested one by one to be able to trim function's body.
-            assert fn_row.argument_types == new_fn_row.argument_types
-            assert fn_row.argument_names == new_fn_row.argument_names
-            assert fn_row.body.strip() == new_fn_row.body.strip()
-            assert fn_row.called_on_null_input == new_fn_row.called_on_null_input
-            assert fn_row.language == new_fn_row.language
-            assert fn_row.return_type == new_fn_row.return_type
+            fn_rows = select_schema_rows(cql, "functions",
+                "argument_types, argument_names, body, called_on_null_input, language, return_type",
+                "function_name", [fn, new_fn], test_keyspace)
+            # The function's body is trimmed, because DESC may change the
+            # whitespace around it. CQL has no function to trim the body
+            # in the query itself.
+            [fn_row], [new_fn_row] = [[r._replace(body=r.body.strip()) for r in fn_rows[f]] for f in (fn, new_fn)]
+            assert fn_row == new_fn_row
         finally:
-            cql.execute(f"DROP FUNCTION {test_keyspace}.{new_fn}")
+            cql.execute(f"DROP FUNCTION IF EXISTS {test_keyspace}.{new_fn}")
 
 # Test that `DESC AGGREGATE {uda}` contains appropriate create statement for user-defined aggregate
 # The test is `scylla_only` because Scylla's UDA is written in Lua, which is not supported by Cassandra
@@ -406,40 +409,35 @@ def test_desc_aggregate(scylla_only, cql, test_keyspace, random_seed):
 
     with new_function(cql, test_keyspace, f"{fn_schema} {fn_null} {fn_return} {fn_language} AS '{fn_body}'") as fn:
         agg_body = f"(int) SFUNC {fn} STYPE int INITCOND 0"
-        with new_aggregate(cql, test_keyspace, agg_body) as aggr: 
-            desc = cql.execute(f"DESC AGGREGATE {test_keyspace}.{aggr}")
-            desc_stmt = desc.one().create_statement
-
-            new_aggr = unique_name()
-            new_desc_stmt = desc_stmt.replace(f"{test_keyspace}.{aggr}", f"{test_keyspace}.{new_aggr}")
-
-            try:
-                cql.execute(new_desc_stmt)
-                aggr_row = cql.execute(f"""
-                    SELECT argument_types, final_func, initcond, return_type, state_func, state_type
-                    FROM system_schema.aggregates
-                    WHERE keyspace_name='{test_keyspace}' AND aggregate_name='{aggr}'
-                """).one()
-                new_aggr_row = cql.execute(f"""
-                    SELECT argument_types, final_func, initcond, return_type, state_func, state_type
-                    FROM system_schema.aggregates
-                    WHERE keyspace_name='{test_keyspace}' AND aggregate_name='{new_aggr}'
-                """).one()
-                assert aggr_row == new_aggr_row
-
-                aggr_scylla_row = cql.execute(f"""
-                    SELECT argument_types, reduce_func, state_type
-                    FROM system_schema.scylla_aggregates
-                    WHERE keyspace_name='{test_keyspace}' AND aggregate_name='{aggr}'
-                """).one()
-                new_aggr_scylla_row = cql.execute(f"""
-                    SELECT argument_types, reduce_func, state_type
-                    FROM system_schema.scylla_aggregates
-                    WHERE keyspace_name='{test_keyspace}' AND aggregate_name='{new_aggr}'
-                """).one()
-                assert aggr_scylla_row == new_aggr_scylla_row
-            finally:
-                cql.execute(f"DROP AGGREGATE {test_keyspace}.{new_aggr}")
+        drop_new_aggr = None
+        try:
+            with new_aggregate(cql, test_keyspace, agg_body) as aggr: 
+                desc = cql.execute(f"DESC AGGREGATE {test_keyspace}.{aggr}")
+                desc_stmt = desc.one().create_statement
+
+                new_aggr = unique_name()
+                new_desc_stmt = rename_element(desc_stmt, f"{test_keyspace}.{aggr}", f"{test_keyspace}.{new_aggr}")
+
+                try:
+                    cql.execute(new_desc_stmt)
+                    get_aggr_rows = select_schema_rows_async(cql, "aggregates",
+                        "argument_types, final_func, initcond, return_type, state_func, state_type",
+                        "aggregate_name", [aggr, new_aggr], test_keyspace)
+                    get_aggr_scylla_rows = select_schema_rows_async(cql, "scylla_aggregates",
+                        "argument_types, reduce_func, state_type",
+                        "aggregate_name", [aggr, new_aggr], test_keyspace)
+                    aggr_rows, aggr_scylla_rows = get_aggr_rows(), get_aggr_scylla_rows()
+
+                    assert aggr_rows[aggr] == aggr_rows[new_aggr]
+                    assert aggr_scylla_rows[aggr] == aggr_scylla_rows[new_aggr]
+                finally:
+                    # Drop the new aggregate concurrently with `aggr`, which is
+                    # dropped when leaving the `with` block.
+                    drop_new_aggr = cql.execute_async(f"DROP AGGREGATE IF EXISTS {test_keyspace}.{new_aggr}")
+        finally:
+            # Both aggregates use `fn`, so they have to be gone before it is dropped.
+            if drop_new_aggr:
+                drop_new_aggr.result()
 
 # Test that `DESC TABLE {tbl} WITH INTERNALS` contains additional information for added/dropped columns
 def test_desc_table_internals(cql, test_keyspace):
@@ -467,42 +465,42 @@ def test_desc_keyspace_elements(cql, random_seed):
         with new_random_type(cql, ks) as udt:
             with new_random_table(cql, ks, [udt]) as tbl:
                 desc = cql.execute(f"DESC KEYSPACE {ks}")
-                ks_desc = " ".join([r.create_statement for r in desc])
+                ks_desc = created_elements(desc)
 
-                assert f"CREATE KEYSPACE {ks}" in ks_desc
-                assert f"CREATE TYPE {udt}" in ks_desc
-                assert f"CREATE TABLE {tbl}" in ks_desc
+                assert ("KEYSPACE", ks) in ks_desc
+                assert ("TYPE", udt) in ks_desc
+                assert ("TABLE", tbl) in ks_desc
 
                 only_desc = cql.execute(f"DESC ONLY KEYSPACE {ks}")
-                ks_only_desc = " ".join([r.create_statement for r in only_desc])
+                ks_only_desc = created_elements(only_desc)
 
-                assert f"CREATE KEYSPACE {ks}" in ks_only_desc
-                assert f"CREATE TYPE {udt}" not in ks_only_desc
-                assert f"CREATE TABLE {tbl}" not in ks_only_desc
+                assert ("KEYSPACE", ks) in ks_only_desc
+                assert ("TYPE", udt) not in ks_only_desc
+                assert ("TABLE", tbl) not in ks_only_desc
 
 # Test that `DESC SCHEMA` contains all information for user created keyspaces
 # and `DESC FULL SCHEMA` contains also information for system keyspaces
-def test_desc_schema(cql, test_keyspace, random_seed):
+def test_desc_schema(cql, test_keyspace, shared_random_element, random_seed):
+    tbl1 = shared_random_element(new_random_table)
     with new_random_keyspace(cql) as ks:
-        with new_random_table(cql, test_keyspace) as tbl1, new_random_table(cql, ks) as tbl2:
+        with new_random_table(cql, ks) as tbl2:
             desc = cql.execute("DESC SCHEMA")
-            schema_desc = " ".join([r.create_statement for r in desc])
+            schema_desc = created_elements(desc)
 
-            assert f"CREATE KEYSPACE {test_keyspace}" in schema_desc
-            assert f"CREATE TABLE {tbl1}" in schema_desc
-            assert f"CREATE KEYSPACE {ks}" in schema_desc
-            assert f"CREATE TABLE {tbl2}" in schema_desc
+            assert ("KEYSPACE", test_keyspace) in schema_desc
+            assert ("KEYSPACE", get_keyspace(tbl1)) in schema_desc
+            assert ("TABLE", tbl1) in schema_desc
+            assert ("KEYSPACE", ks) in schema_desc
+            assert ("TABLE", tbl2) in schema_desc
 
+            # Every described element comes in its own row, so the described
+            # keyspaces can be collected from the rows' metadata without
+            # looking at the create statements at all.
             full_desc = cql.execute("DESC FULL SCHEMA")
-            schema_full_desc = " ".join([r.create_statement for r in full_desc])
+            described_kss = {r.keyspace_name for r in full_desc if r.type == "keyspace"}
 
             kss = cql.execute("SELECT keyspace_name FROM system_schema.keyspaces")
-            tbls = cql.execute("SELECT keyspace_name, table_name FROM system_schema.tables")
-
-            for ks_row in kss:
-                assert f"CREATE KEYSPACE {maybe_quote(ks_row.keyspace_name)}" in schema_full_desc
-            for tbl_row in tbls:
-                assert f"CREATE TABLE {maybe_quote(tbl_row.keyspace_name)}.{maybe_quote(tbl_row.table_name)}"
+            assert {maybe_quote(r.keyspace_name) for r in kss} <= described_kss
 
 # Test that `DESC CLUSTER` contains token ranges to endpoints map
 # The test is `scylla_only` because there is no `system.token_ring` table in Cassandra
@@ -520,18 +518,26 @@ def test_desc_cluster(scylla_only, cql, test_keyspace):
         # When run with tablets, this test currently only validates that `DESC CLUSTER` doesn't fail with tablets.
         return
 
-    desc_endpoints = []
-    for (end_token, endpoints) in desc.range_ownership.items():
-        for endpoint in endpoints:
-            desc_endpoints.append((end_token, endpoint))
+    # The order of the endpoints doesn't matter, so compare them as multisets
+    # instead of sorting both sides.
+    desc_endpoints = Counter((end_token, endpoint)
+        for (end_token, endpoints) in desc.range_ownership.items() for endpoint in endpoints)
 
-    result = cql.execute(f"SELECT end_token, endpoint FROM system.token_ring WHERE keyspace_name='{test_keyspace}' ORDER BY table_name, start_token")
-    ring_endpoints = [(r.end_token, r.endpoint) for r in result]
-    
-    assert sorted(desc_endpoints) == sorted(ring_endpoints)
+    result = cql.execute(f"SELECT end_token, endpoint FROM system.token_ring WHERE keyspace_name='{test_keyspace}'")
+    ring_endpoints = Counter((r.end_token, r.endpoint) for r in result)
+
+    assert desc_endpoints == ring_endpoints
+
+# The answer can't change during a session, and new_random_table() asks for
+# it every time, so it's cached instead of scanning system_schema.tables
+# again on each call. The cache holds the sessions weakly, so sessions which
+# were shut down can still be freed.
+_is_scylla_by_session = weakref.WeakKeyDictionary()
 
 def is_scylla(cql):
-    return any('scylla' in name for name in [row.table_name for row in cql.execute("SELECT * FROM system_schema.tables WHERE keyspace_name = 'system'")])
+    if cql not in _is_scylla_by_session:
+        _is_scylla_by_session[cql] = any('scylla' in name for name in [row.table_name for row in cql.execute("SELECT * FROM system_schema.tables WHERE keyspace_name = 'system'")])
+    return _is_scylla_by_session[cql]
 
 # Test that 'DESC INDEX' contains create statement of index
 def test_desc_index(cql, test_keyspace):
@@ -728,15 +734,12 @@ def test_generic_desc(cql, random_seed):
         with new_random_table(cql, ks) as t1, new_test_table(cql, ks, "a int primary key, b int, c int") as tbl:
             cql.execute(f"CREATE INDEX idx ON {tbl}(b)")
             
-            generic_ks = cql.execute(f"DESC {ks}")
-            generic_t1 = cql.execute(f"DESC {t1}")
-            generic_tbl = cql.execute(f"DESC {tbl}")
-            generic_idx = cql.execute(f"DESC {ks}.idx")
-
-            desc_ks = cql.execute(f"DESC KEYSPACE {ks}")
-            desc_t1 = cql.execute(f"DESC TABLE {t1}")
-            desc_tbl = cql.execute(f"DESC TABLE {tbl}")
-            desc_idx = cql.execute(f"DESC INDEX {ks}.idx")
+            # The describe statements are independent of each other, so send
+            # all of them before waiting for any result.
+            futures = [cql.execute_async(stmt) for stmt in [
+                f"DESC {ks}", f"DESC {t1}", f"DESC {tbl}", f"DESC {ks}.idx",
+                f"DESC KEYSPACE {ks}", f"DESC TABLE {t1}", f"DESC TABLE {tbl}", f"DESC INDEX {ks}.idx"]]
+            generic_ks, generic_t1, generic_tbl, generic_idx, desc_ks, desc_t1, desc_tbl, desc_idx = [f.result() for f in futures]
 
             assert generic_ks == desc_ks
             assert generic_t1 == desc_t1
@@ -747,9 +750,9 @@ def test_generic_desc(cql, random_seed):
 # Since Cassandra doesn't generic description of support user-defined objects,
 # the test is `scylla_only`.
 # Reproduces #14170
-def test_generic_desc_user_defined(scylla_only, cql, test_keyspace):
-    with new_random_type(cql, test_keyspace) as udt:
-        assert cql.execute(f"DESC {udt}") == cql.execute(f"DESC TYPE {udt}")
+def test_generic_desc_user_defined(scylla_only, cql, test_keyspace, shared_random_element, random_seed):
+    udt = shared_random_element(new_random_type)
+    assert cql.execute(f"DESC {udt}") == cql.execute(f"DESC TYPE {udt}")
 
     with new_function(cql, test_keyspace, """
         (val1 int, val2 int)
@@ -845,39 +848,46 @@ def test_udt_sorting(scylla_only, cql, test_keyspace, random_seed):
 # The tests don't check if create statements are correct, but only assert if the name inside is quoted.
 # Names which are testes are extracted to separate variable at the beginning of each test.
 
-def test_keyspaces_quoting(cql):
+# All the tests below use the same keyspace, whose name requires quoting.
+# Creating and dropping a keyspace is expensive, so it's created only once
+# and each test drops only the elements it created inside it.
+@pytest.fixture(scope="module")
+def quoted_ks(cql):
     # Keyspace name must match [a-zA-Z0-9_]+, so the only names which require quoting
     # are the ones with capital letters.
-    name = "Quoted_KS"
-
+    # The name is made unique, because with pytest-xdist the tests of this
+    # file may be spread over several workers, each with its own instance
+    # of this fixture, while all of them may talk to the same server.
+    name = f"Quoted_KS_{unique_name()}"
     cql.execute(f"CREATE KEYSPACE \"{name}\" WITH REPLICATION = {{'class': 'NetworkTopologyStrategy', 'replication_factor': 1}}")
-    try:
-        desc = cql.execute(f"DESC KEYSPACE \"{name}\"").one().create_statement
+    yield name
+    cql.execute(f"DROP KEYSPACE \"{name}\"")
 
-        # Check if name in create statement is quoted
-        assert f"CREATE KEYSPACE \"{name}\" WITH" in desc
-        assert f"CREATE KEYSPACE {name} WITH" not in desc
+def test_keyspaces_quoting(cql, cql_without_use, quoted_ks):
+    name = quoted_ks
 
-        # Check if name if keyspaces listing is quoted
-        with new_cql(cql) as ncql:
-            keyspaces_list = [(r.keyspace_name, r.name) for r in ncql.execute("DESC KEYSPACES")]
+    desc = cql.execute(f"DESC KEYSPACE \"{name}\"").one().create_statement
 
-            assert (f"\"{name}\"", f"\"{name}\"") in keyspaces_list
-            assert (f"\"{name}\"", name) not in keyspaces_list
-            assert (name, f"\"{name}\"") not in keyspaces_list
-    finally:
-        cql.execute(f"DROP KEYSPACE \"{name}\"")
+    # Check if name in create statement is quoted
+    assert f"CREATE KEYSPACE \"{name}\" WITH" in desc
+    assert f"CREATE KEYSPACE {name} WITH" not in desc
+
+    # Check if name if keyspaces listing is quoted
+    keyspaces_list = [(r.keyspace_name, r.name) for r in cql_without_use.execute("DESC KEYSPACES")]
 
-def test_table_quoting(cql):
+    assert (f"\"{name}\"", f"\"{name}\"") in keyspaces_list
+    assert (f"\"{name}\"", name) not in keyspaces_list
+    assert (name, f"\"{name}\"") not in keyspaces_list
+
+def test_table_quoting(cql, cql_without_use, quoted_ks):
     # Table name must match [a-zA-Z0-9_]+, so the only names which require quoting
     # are the ones with capital letters.
-    ks_name = "Quoted_KS"
+    ks_name = quoted_ks
     name = "Quoted_TABLE"
     col_name = "!@#$%"
 
-    cql.execute(f"CREATE KEYSPACE \"{ks_name}\" WITH REPLICATION = {{'class': 'NetworkTopologyStrategy', 'replication_factor': 1}}")
+    cql.execute(f"CREATE TABLE \"{ks_name}\".\"{name}\"(a int primary key, \"{col_name}\" int)")
     try:
-        cql.execute(f"CREATE TABLE \"{ks_name}\".\"{name}\"(a int primary key, \"{col_name}\" int)")
         desc = cql.execute(f"DESC TABLE \"{ks_name}\".\"{name}\"").one().create_statement
 
         assert f"CREATE TABLE \"{ks_name}\".\"{name}\"" in desc
@@ -894,24 +904,21 @@ def test_table_quoting(cql):
         assert f"ALTER TABLE \"{ks_name}\".\"{name}\" DROP \"!@#$%\"" in desc_alter
         assert f"ALTER TABLE \"{ks_name}\".\"{name}\" ADD \"!@#$%\"" in desc_alter
 
-        with new_cql(cql) as ncql:
-            tables_list = [(r.keyspace_name, r.name) for r in ncql.execute("DESC TABLES")]
+        tables_list = [(r.keyspace_name, r.name) for r in cql_without_use.execute("DESC TABLES")]
 
-            assert (f"\"{ks_name}\"", f"\"{name}\"") in tables_list
-            assert (f"\"{ks_name}\"", name) not in tables_list
-            assert (ks_name, f"\"{name}\"") not in tables_list
+        assert (f"\"{ks_name}\"", f"\"{name}\"") in tables_list
+        assert (f"\"{ks_name}\"", name) not in tables_list
+        assert (ks_name, f"\"{name}\"") not in tables_list
     finally:
         cql.execute(f"DROP TABLE \"{ks_name}\".\"{name}\"")
-        cql.execute(f"DROP KEYSPACE \"{ks_name}\"")
 
-def test_type_quoting(cql):
-    ks_name = "Quoted_KS"
+def test_type_quoting(cql, cql_without_use, quoted_ks):
+    ks_name = quoted_ks
     name = "udt_@@@"
     field_name = "field_!!!"
 
-    cql.execute(f"CREATE KEYSPACE \"{ks_name}\" WITH REPLICATION = {{'class': 'NetworkTopologyStrategy', 'replication_factor': 1}}")
+    cql.execute(f"CREATE TYPE \"{ks_name}\".\"{name}\" (a int, \"{field_name}\" text)")
     try:
-        cql.execute(f"CREATE TYPE \"{ks_name}\".\"{name}\" (a int, \"{field_name}\" text)")
         desc = cql.execute(f"DESC TYPE \"{ks_name}\".\"{name}\"").one().create_statement
 
         assert f"CREATE TYPE \"{ks_name}\".\"{name}\"" in desc
@@ -922,79 +929,73 @@ def test_type_quoting(cql):
         assert f"\"{field_name}\" text" in desc
         assert f"{field_name} text" not in desc
 
-        with new_cql(cql) as ncql:
-            types_list = [(r.keyspace_name, r.name) for r in ncql.execute("DESC TYPES")]
+        types_list = [(r.keyspace_name, r.name) for r in cql_without_use.execute("DESC TYPES")]
 
-            assert (f"\"{ks_name}\"", f"\"{name}\"") in types_list
-            assert (f"\"{ks_name}\"", name) not in types_list
-            assert (ks_name, f"\"{name}\"") not in types_list
+        assert (f"\"{ks_name}\"", f"\"{name}\"") in types_list
+        assert (f"\"{ks_name}\"", name) not in types_list
+        assert (ks_name, f"\"{name}\"") not in types_list
     finally:
         cql.execute(f"DROP TYPE \"{ks_name}\".\"{name}\"")
-        cql.execute(f"DROP KEYSPACE \"{ks_name}\"")
 
-def test_function_quoting(scylla_only, cql, test_keyspace):
-    ks_name = "Quoted_KS"
+def test_function_quoting(scylla_only, cql, cql_without_use, quoted_ks):
+    ks_name = quoted_ks
     name = "!udf!"
 
-    cql.execute(f"CREATE KEYSPACE \"{ks_name}\" WITH REPLICATION = {{'class': 'NetworkTopologyStrategy', 'replication_factor': 1}}")
+    cql.execute(f"""
+        CREATE FUNCTION \"{ks_name}\".\"{name}\"(val int)
+        RETURNS NULL ON NULL INPUT
+        RETURNS int
+        LANGUAGE lua
+        AS $$ return val $$
+    """)
     try:
-        cql.execute(f"""
-            CREATE FUNCTION \"{ks_name}\".\"{name}\"(val int)
-            RETURNS NULL ON NULL INPUT
-            RETURNS int
-            LANGUAGE lua
-            AS $$ return val $$
-        """)
         desc = cql.execute(f"DESC FUNCTION \"{ks_name}\".\"{name}\"").one().create_statement
 
         assert f"CREATE FUNCTION \"{ks_name}\".\"{name}\"" in desc
         assert f"CREATE FUNCTION \"{ks_name}\".{name}" not in desc
         assert f"CREATE FUNCTION {ks_name}.\"{name}\"" not in desc
 
-        with new_cql(cql) as ncql:
-            udf_list = [(r.keyspace_name, r.name) for r in ncql.execute("DESC FUNCTIONS")]
+        udf_list = [(r.keyspace_name, r.name) for r in cql_without_use.execute("DESC FUNCTIONS")]
 
-            assert (f"\"{ks_name}\"", f"\"{name}\"") in udf_list
-            assert (f"\"{ks_name}\"", name) not in udf_list
-            assert (ks_name, f"\"{name}\"") not in udf_list
+        assert (f"\"{ks_name}\"", f"\"{name}\"") in udf_list
+        assert (f"\"{ks_name}\"", name) not in udf_list
+        assert (ks_name, f"\"{name}\"") not in udf_list
     finally:
         cql.execute(f"DROP FUNCTION \"{ks_name}\".\"{name}\"")
-        cql.execute(f"DROP KEYSPACE \"{ks_name}\"")
 
-def test_aggregate_quoting(scylla_only, cql, test_keyspace):
-    ks_name = "Quoted_KS"
+def test_aggregate_quoting(scylla_only, cql, cql_without_use, quoted_ks):
+    ks_name = quoted_ks
     sfunc_name = "!udf!"
     name = "'uda'!"
 
-    cql.execute(f"CREATE KEYSPACE \"{ks_name}\" WITH REPLICATION = {{'class': 'NetworkTopologyStrategy', 'replication_factor': 1}}")
+    cql.execute(f"""
+        CREATE FUNCTION \"{ks_name}\".\"{sfunc_name}\"(val1 int, val2 int)
+        RETURNS NULL ON NULL INPUT
+        RETURNS int
+        LANGUAGE lua
+        AS $$ return val1 + val2 $$
+    """)
     try:
-        cql.execute(f"""
-            CREATE FUNCTION \"{ks_name}\".\"{sfunc_name}\"(val1 int, val2 int)
-            RETURNS NULL ON NULL INPUT
-            RETURNS int
-            LANGUAGE lua
-            AS $$ return val1 + val2 $$
-        """)
         cql.execute(f"""
             CREATE AGGREGATE \"{ks_name}\".\"{name}\"(int)
             SFUNC \"{sfunc_name}\"
             STYPE int
         """)
-        desc = cql.execute(f"DESC AGGREGATE \"{ks_name}\".\"{name}\"").one().create_statement
+        try:
+            desc = cql.execute(f"DESC AGGREGATE \"{ks_name}\".\"{name}\"").one().create_statement
 
-        assert f"CREATE AGGREGATE \"{ks_name}\".\"{name}\"" in desc
-        assert f"SFUNC \"{sfunc_name}\"" in desc
+            assert f"CREATE AGGREGATE \"{ks_name}\".\"{name}\"" in desc
+            assert f"SFUNC \"{sfunc_name}\"" in desc
 
-        with new_cql(cql) as ncql:
-            uda_list = [(r.keyspace_name, r.name) for r in ncql.execute("DESC AGGREGATES")]
+            uda_list = [(r.keyspace_name, r.name) for r in cql_without_use.execute("DESC AGGREGATES")]
 
             assert (f"\"{ks_name}\"", f"\"{name}\"") in uda_list
             assert (f"\"{ks_name}\"", name) not in uda_list
             assert (ks_name, f"\"{name}\"") not in uda_list
+        finally:
+            cql.execute(f"DROP AGGREGATE \"{ks_name}\".\"{name}\"")
     finally:
-        cql.execute(f"DROP AGGREGATE \"{ks_name}\".\"{name}\"")
         cql.execute(f"DROP FUNCTION \"{ks_name}\".\"{sfunc_name}\"")
-        cql.execute(f"DROP KEYSPACE \"{ks_name}\"")
 
 # Test if fields and options (column names, column types, comment) inside table's description are quoted properly
 def test_table_options_quoting(cql, test_keyspace):
@@ -1521,32 +1522,83 @@ def create_udt_body(udts):
     fields_joined = ", ".join(fields)
     return f"({fields_joined})"
 
+def get_keyspace(name_with_ks):
+    return name_with_ks.split(".")[0]
+
 def get_name(name_with_ks):
     return name_with_ks.split(".")[1]
 
+# Prepares `query` once per session. The tests execute the same few
+# system_schema queries over and over, only with different names bound.
+@functools.lru_cache(maxsize=None)
+def prepare_cached(cql, query):
+    return cql.prepare(query)
+
+# Reads `columns` of `system_schema.{table}` for all elements called `names`
+# with a single query, instead of querying each element separately. The rows
+# are returned grouped by the element's name (the value of `name_column`).
+# `keyspace` restricts the query to a keyspace, for tables whose elements are
+# not keyspaces themselves.
+# The name column is blanked in the returned rows, so that rows describing
+# identical elements with different names compare equal.
+def select_schema_rows(cql, table, columns, name_column, names, keyspace=None):
+    return select_schema_rows_async(cql, table, columns, name_column, names, keyspace)()
+
+# Like select_schema_rows(), but only sends the query and returns a function
+# which waits for the query's result. This allows a test to have several
+# independent queries in flight at the same time.
+def select_schema_rows_async(cql, table, columns, name_column, names, keyspace=None):
+    select = f"SELECT {name_column}, {columns} FROM system_schema.{table}"
+    if keyspace is None:
+        stmt = prepare_cached(cql, f"{select} WHERE {name_column} IN ?")
+        values = (names,)
+    else:
+        stmt = prepare_cached(cql, f"{select} WHERE keyspace_name = ? AND {name_column} IN ?")
+        values = (keyspace, names)
+    future = cql.execute_async(stmt, values)
+    def result():
+        rows_by_name = {name: [] for name in names}
+        for row in future.result():
+            rows_by_name[getattr(row, name_column)].append(row._replace(**{name_column: None}))
+        return rows_by_name
+    return result
+
+# Matches the beginning of a create statement: the kind of the created
+# element and its (possibly quoted and keyspace-qualified) name.
+_IDENT_RE = r'(?:"(?:[^"]|"")*"|\w+)'
+_CREATE_RE = re.compile(rf'^CREATE (KEYSPACE|TABLE|TYPE|FUNCTION|AGGREGATE) ({_IDENT_RE}(?:\.{_IDENT_RE})?)', re.MULTILINE)
+
+# Returns a set of (kind, name) pairs of all elements created by the create
+# statements in the given DESC result, e.g. ("TABLE", "ks.tbl"), so a test can
+# check for the presence of many elements without rescanning the whole output
+# for each of them.
+def created_elements(desc):
+    return frozenset(m for r in desc for m in _CREATE_RE.findall(r.create_statement))
+
+# Returns the create statement `stmt` with the name of the created element
+# changed from `old` to `new`. Only the first occurrence of `old` which is not
+# a part of a longer identifier is replaced. That occurrence is the element's
+# name, so other mentions of it (e.g. in a comment or as a prefix of a column
+# name) are kept intact.
+def rename_element(stmt, old, new):
+    return re.sub(rf'(?<![\w"]){re.escape(old)}(?![\w"])', lambda _: new, stmt, count=1)
+
+# Matches any character which makes an identifier require quoting.
+_NEEDS_QUOTES_RE = re.compile(r'[^a-z0-9_]')
+
 # Takes an identifier and quotes it when needed.
 # This is a copy of `maybe_quote` from cql3's utils.
 # (see 'cql3/cql3_type.cc:430')
 # NOTE: This function is missing a functionality of running cql's grammar function
 def maybe_quote(ident):
-    if not len(ident):
+    if not ident:
         return "\"\""
 
-    need_quotes = False
-    num_quotes = 0
-    for c in ident:
-        if not (('a' <= c and c <= 'z') or ('0' <= c and c <= '9') or c =='_'):
-            need_quotes = True
-            num_quotes += (c == '"')
-
-    if not need_quotes:
+    if not _NEEDS_QUOTES_RE.search(ident):
         # TODO: Here is missing part from C++ implementation (see cql3/cql3_type.cc:448)
         # Here function from Cql.g (cident) is used to ensure the ident doesn't need quoting.
         return ident
-    
-    if num_quotes == 0:
-        return '"' + ident + '"'
-    
+
     return '"' + ident.replace('"', "\"\"") + '"'
 
 ### ---------------------------------------------------------------------------
@@ -1568,18 +1620,30 @@ max_static = 3
 # Chance of counter table instead of normal one
 counter_table_chance = 0.1
 
+# Choices for the options of random keyspaces and tables
+keyspace_strategies = ("SimpleStrategy", "NetworkTopologyStrategy")
+keyspace_durable_writes = ("true", "false")
+table_caching_keys = ("ALL", "NONE")
+table_compactions = ("SizeTieredCompactionStrategy", "TimeWindowCompactionStrategy", "LeveledCompactionStrategy")
+table_speculative_retries = ("ALWAYS", "NONE", "99.0PERCENTILE", "50.00ms")
+table_compressions = ("LZ4Compressor", "SnappyCompressor", "DeflateCompressor")
+
+# Choices for random types
+native_types = ("text", "bigint", "boolean", "decimal", "double", "float", "int")
+collection_types = ("set", "list", "map")
+type_kinds = ("native", "collection", "tuple")
+type_kinds_with_udt = type_kinds + ("UDT",)
+
 # A utility function for obtaining random native type
 def get_random_native_type():
-    types = ["text", "bigint", "boolean", "decimal", "double", "float", "int"]
-    return random.choice(types)
+    return random.choice(native_types)
 
 # A utility function for obtaining random collection type.
 # `udts` argument represents user-defined types that can be used for
 # creating the collection type. If `frozen` is true, then the function will
 # return `frozen<collection_type>`
 def get_random_collection_type(cql, keyspace, depth, udts=[], frozen=False):
-    types = ["set", "list", "map"]
-    collection_type = random.choice(types)
+    collection_type = random.choice(collection_types)
 
     if collection_type == "set":
         return_type = f"set<{get_random_type(cql, keyspace, depth-1, udts, True)}>"
@@ -1606,10 +1670,7 @@ def get_random_tuple_type(cql, keyspace, depth, udts=[], frozen=False):
 # user-defined types that can be returned or used for creation of other types
 # If `frozen` is true, then the function will return `frozen<some_type>`
 def get_random_type(cql, keyspace, depth, udts=[], frozen=False):
-    types = ["native", "collection", "tuple"]
-    if len(udts) != 0:
-        types.append("UDT")
-    type_type = random.choice(types)
+    type_type = random.choice(type_kinds_with_udt if udts else type_kinds)
 
     if type_type == "native" or depth <= 0: # native type
         return get_random_native_type()
@@ -1622,19 +1683,15 @@ def get_random_type(cql, keyspace, depth, udts=[], frozen=False):
         return f"frozen<{udt}>" if frozen else udt
 
 def new_random_keyspace(cql):
-    strategies = ["SimpleStrategy", "NetworkTopologyStrategy"]
-    writes = ["true", "false"]
-
-    options = {}
-    options["class"] = random.choice(strategies)
-    options["replication_factor"] = random.randrange(1, 6)
-    options_str = ", ".join([f"'{k}': '{v}'" for (k, v) in options.items()])
+    strategy = random.choice(keyspace_strategies)
+    rf = random.randrange(1, 6)
+    options_str = f"'class': '{strategy}', 'replication_factor': '{rf}'"
     extra = ""
     # Cassandra does not have tablets and thus does not even support tablets syntax.
-    if not has_tablets or options["class"] == "SimpleStrategy" or options["replication_factor"] != 1:
+    if not has_tablets or strategy == "SimpleStrategy" or rf != 1:
         extra = " and tablets = { 'enabled': false }"
 
-    write = random.choice(writes)
+    write = random.choice(keyspace_durable_writes)
     return new_test_keyspace(cql, f"with replication = {{{options_str}}} and durable_writes = {write}{extra}")
 
 # A utility function for creating random table. `udts` argument represents
@@ -1673,20 +1730,14 @@ def new_random_table(cql, keyspace, udts=[], tablet_options={}):
         extras["default_time_to_live"] = random.randrange(1000000)
 
 
-    caching_keys = ["ALL", "NONE"]
     caching_rows = ["ALL", "NONE", random.randrange(1000000)]
-    caching_k = random.choice(caching_keys)
+    caching_k = random.choice(table_caching_keys)
     caching_r = random.choice(caching_rows)
     extras["caching"] = f"{{'keys':'{caching_k}', 'rows_per_partition':'{caching_r}'}}"
 
-    compactions = ["SizeTieredCompactionStrategy", "TimeWindowCompactionStrategy", "LeveledCompactionStrategy"]
-    extras["compaction"] = f"{{'class': '{random.choice(compactions)}'}}"
-
-    speculative_retries = ["ALWAYS", "NONE", "99.0PERCENTILE", "50.00ms"]
-    extras["speculative_retry"] = f"'{random.choice(speculative_retries)}'"
-
-    compressions = ["LZ4Compressor", "SnappyCompressor", "DeflateCompressor"]
-    extras["compression"] = f"{{'sstable_compression': '{random.choice(compressions)}'}}"
+    extras["compaction"] = f"{{'class': '{random.choice(table_compactions)}'}}"
+    extras["speculative_retry"] = f"'{random.choice(table_speculative_retries)}'"
+    extras["compression"] = f"{{'sstable_compression': '{random.choice(table_compressions)}'}}"
 
     # see the last element of `probs` defined by scylladb/utils/bloom_calculation.cc,
     # the minimum false positive rate supported by the bloom filter is determined by
@@ -40,6 +40,20 @@ class NoSuchProcess(Exception):
     ...
 
 
+class ManagerRESTClient(UnixRESTClient):
+    """UnixRESTClient for the Manager, which reports every finished request"""
+
+    def __init__(self, sock_path: str, on_request_done: Callable[[], None]):
+        super().__init__(sock_path)
+        self.on_request_done = on_request_done
+
+    async def _fetch(self, *args, **kwargs) -> Any:
+        try:
+            return await super()._fetch(*args, **kwargs)
+        finally:
+            self.on_request_done()
+
+
 @universalasync_typed_wrap
 class ManagerClient:
     """Helper Manager API client
@@ -63,7 +77,12 @@ class ManagerClient:
         self.exclusive_clusters: List[CassandraCluster] = []
         # A client for communicating with ScyllaClusterManager (server)
         self.sock_path = sock_path
-        self.client_for_asyncio_loop = {asyncio.get_running_loop(): UnixRESTClient(sock_path)}
+        self.client_for_asyncio_loop = {asyncio.get_running_loop(): ManagerRESTClient(sock_path, self._request_done)}
+        # Number of requests to the Manager started or finished through
+        # self.client, and the running servers as of the given number of
+        # requests, see running_servers()
+        self._manager_requests = 0
+        self._running_servers: Optional[tuple[int, list[ServerInfo]]] = None
         self.api = ScyllaRESTAPIClient()
         self.metrics = ScyllaMetricsClient()
         self.thread_pool = ThreadPoolExecutor()
@@ -71,8 +90,7 @@ class ManagerClient:
         self.ignore_log_patterns = []  # patterns to ignore in server logs when checking for errors
         self.ignore_cores_log_patterns = []  # patterns to ignore in server logs when checking for core files
 
-    @property
-    def client(self):
+    def _check_client_accessible(self) -> None:
         if self.test_finished_event.is_set():
             raise Exception("ManagerClient.after_test method was called, client object is not accessible anymore")
             # there are still can be issue when some task first obtains the client object,
@@ -80,12 +98,20 @@ class ManagerClient:
             # and there is an actual workaround for this case.
             # It is better to fix the task rather than every time doing
             # close all clients in after_test->create new during after_test->close again after after_test.
+
+    @property
+    def client(self):
+        self._check_client_accessible()
+        self._manager_requests += 1
         _client = self.client_for_asyncio_loop.get(asyncio.get_running_loop(), None)
         if _client is None:
-            _client = UnixRESTClient(self.sock_path)
+            _client = ManagerRESTClient(self.sock_path, self._request_done)
             self.client_for_asyncio_loop[asyncio.get_running_loop()] = _client
         return _client
 
+    def _request_done(self) -> None:
+        self._manager_requests += 1
+
     async def stop(self):
         """Close driver"""
         self.driver_close()
@@ -125,7 +151,8 @@ class ManagerClient:
 
     def get_cql(self) -> CassandraSession:
         """Precondition: driver is connected"""
-        assert self.cql
+        if self.cql is None:
+            raise RuntimeError("ManagerClient.get_cql: driver is not connected")
         return self.cql
 
     # More robust version of get_cql, when topology changes
@@ -168,12 +195,18 @@ class ManagerClient:
         if dirty:
             self.driver_close()  # Close driver connection to old cluster
         try:
-            cluster_str = await self.client.put_json(f"/cluster/before-test/{test_case_name}", timeout=600,
-                                                     response_type = "json")
-            logger.info(f"Using cluster: {cluster_str} for test {test_case_name}")
+            client = self.client
+            requests = self._manager_requests
+            before_test = await client.put_json(f"/cluster/before-test/{test_case_name}", timeout=600,
+                                                response_type = "json")
+            logger.info(f"Using cluster: {before_test['cluster']} for test {test_case_name}")
         except aiohttp.ClientError as exc:
             raise RuntimeError(f"Failed before test check {exc}") from exc
-        servers = await self.running_servers()
+        servers = [ServerInfo(*info) for info in before_test["running_servers"]]
+        # The Manager reported the running servers along with the cluster, so
+        # seed the running_servers() cache to let driver_connect() use them
+        if self._manager_requests == requests + 1:
+            self._running_servers = (self._manager_requests, servers)
         if self.cql is None and servers:
             # TODO: if cluster is not up yet due to taking long and HTTP timeout, wait for it
             # await self._wait_for_cluster()
@@ -300,13 +333,31 @@ class ManagerClient:
         return await self.client.get_json("/cluster/replicas")
 
     async def running_servers(self) -> list[ServerInfo]:
-        """Get List of server info (id and IP address) of running servers"""
+        """Get List of server info (id and IP address) of running servers
+
+           The servers only change as a result of requests to the Manager, so
+           the list is cached until the next request made through self.client
+           starts or finishes.
+        """
+        # A cached result doesn't go through self.client, so check that the
+        # Manager may still be used here
+        self._check_client_accessible()
+        if self._running_servers is not None and self._running_servers[0] == self._manager_requests:
+            return list(self._running_servers[1])
+        client = self.client
+        requests = self._manager_requests
         try:
-            server_info_list = await self.client.get_json("/cluster/running-servers")
+            server_info_list = await client.get_json("/cluster/running-servers")
         except RuntimeError as exc:
             raise Exception("Failed to get list of running servers") from exc
         assert isinstance(server_info_list, list), "running_servers got unknown data type"
-        return [ServerInfo(*info) for info in server_info_list]
+        servers = [ServerInfo(*info) for info in server_info_list]
+        # The count went up once more when this request finished. Don't cache
+        # the result if another request started or finished in the meantime,
+        # it may have changed the servers after the result was computed.
+        if self._manager_requests == requests + 1:
+            self._running_servers = (self._manager_requests, servers)
+        return list(servers)
 
     async def all_servers(self) -> list[ServerInfo]:
         """Get List of server info (id and IP address) of all servers"""
@@ -663,6 +714,20 @@ class ManagerClient:
                                    timeout=timeout)
         self._driver_update()
 
+    async def remove_nodes(self, removals: List[Tuple[ServerNum, ServerNum, List[IPAddress]]],
+                           timeout: Optional[float] = ScyllaServer.TOPOLOGY_TIMEOUT) -> None:
+        """Remove several dead nodes, given as (initiator_id, server_id, ignore_dead) steps.
+
+        The steps run in order, since each removenode must ignore the nodes
+        which are still to be removed, but waiting for the removed nodes to
+        be seen as dead is done once for all of them up front.
+        """
+        removed_ips = await asyncio.gather(*(self.get_host_ip(server_id) for _, server_id, _ in removals))
+        others_ips = [srv.ip_addr for srv in await self.running_servers() if srv.ip_addr not in removed_ips]
+        await asyncio.gather(*(self.server_not_sees_other_servers(ip, removed_ips) for ip in others_ips))
+        for initiator_id, server_id, ignore_dead in removals:
+            await self.remove_node(initiator_id, server_id, ignore_dead, wait_removed_dead=False, timeout=timeout)
+
     async def decommission_node(self, server_id: ServerNum,
                                 expected_error: str | None = None,
                                 timeout: Optional[float] = ScyllaServer.TOPOLOGY_TIMEOUT) -> None:
@@ -752,7 +817,7 @@ class ManagerClient:
         """Waits until dst_server_id knows about expect_host_id, with timeout"""
         async def host_is_known():
             host_id_map = await self.api.get_host_id_map(dst_server_ip)
-            return True if any(entry for entry in host_id_map if entry['value'] == expect_host_id) else None
+            return True if any(entry['value'] == expect_host_id for entry in host_id_map) else None
 
         return await wait_for(host_is_known, deadline or (time() + 30))
 
@@ -804,34 +869,52 @@ class ManagerClient:
         if count < 1:
             return
         server_ip = await self.get_host_ip(server_id)
+        await self._server_ip_sees_others(server_ip, count, interval)
+
+    async def _server_ip_sees_others(self, server_ip: IPAddress, count: int, interval: float) -> None:
+        """Like server_sees_others(), for a server whose IP address is already known"""
+        if count < 1:
+            return
         async def _sees_min_others():
             alive_nodes = await self.api.get_alive_endpoints(server_ip)
             if len(alive_nodes) > count:
                 return True
-        await wait_for(_sees_min_others, time() + interval, period=.5)
+        await wait_for(_sees_min_others, time() + interval, period=.05, backoff_factor=2)
 
     async def server_sees_other_server(self, server_ip: IPAddress, other_ip: IPAddress,
                                        interval: float = 45.):
         """Wait till a server sees another specific server IP as alive"""
-        async def _sees_another_server():
+        await self.server_sees_other_servers(server_ip, [other_ip], interval)
+
+    async def server_sees_other_servers(self, server_ip: IPAddress, other_ips: List[IPAddress],
+                                        interval: float = 45.):
+        """Wait till a server sees all of the given server IPs as alive"""
+        other_ips = set(other_ips)
+        async def _sees_other_servers():
             alive_nodes = await self.api.get_alive_endpoints(server_ip)
-            if other_ip in alive_nodes:
+            if other_ips.issubset(alive_nodes):
                 return True
-        await wait_for(_sees_another_server, time() + interval, period=.5)
+        await wait_for(_sees_other_servers, time() + interval, period=.05, backoff_factor=2)
 
     async def servers_see_each_other(self, servers: List[ServerInfo], interval: float = 45.):
         """Wait till all servers see all other servers in the list"""
-        others = [self.server_sees_others(srv.server_id, len(servers) - 1, interval) for srv in servers]
+        others = [self._server_ip_sees_others(srv.ip_addr, len(servers) - 1, interval) for srv in servers]
         await asyncio.gather(*others)
 
     async def server_not_sees_other_server(self, server_ip: IPAddress, other_ip: IPAddress,
                                            interval: float = 45.):
         """Wait till a server sees another specific server IP as dead"""
-        async def _not_sees_another_server():
+        await self.server_not_sees_other_servers(server_ip, [other_ip], interval)
+
+    async def server_not_sees_other_servers(self, server_ip: IPAddress, other_ips: List[IPAddress],
+                                            interval: float = 45.):
+        """Wait till a server sees all of the given server IPs as dead"""
+        other_ips = set(other_ips)
+        async def _not_sees_other_servers():
             alive_nodes = await self.api.get_alive_endpoints(server_ip)
-            if not other_ip in alive_nodes:
+            if other_ips.isdisjoint(alive_nodes):
                 return True
-        await wait_for(_not_sees_another_server, time() + interval, period=.5)
+        await wait_for(_not_sees_other_servers, time() + interval, period=.05, backoff_factor=2)
 
     async def others_not_see_server(self, server_ip: IPAddress, interval: float = 45.):
         """Wait till a server is seen as dead by all other running servers in the cluster"""
@@ -1907,9 +1907,12 @@ class ScyllaClusterManager:
         server = self.cluster.servers[ServerNum(int(request.match_info["server_id"]))]
         return await server.get_host_id(self.cluster.api)
 
-    async def _before_test_req(self, request) -> str:
+    async def _before_test_req(self, request) -> dict[str, Any]:
+        """Prepare the cluster for a test. Besides the cluster's description,
+           returns its running servers, which the client needs to connect its
+           driver, to save it the round trip for asking separately."""
         cluster_str = await self._before_test(request.match_info['test_case_name'])
-        return cluster_str
+        return {"cluster": cluster_str, "running_servers": self.cluster.running_servers()}
 
     async def _after_test(self, _request) -> dict[str, bool]:
         assert self.cluster is not None
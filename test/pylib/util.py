@@ -105,7 +105,7 @@ async def wait_for_cql(cql: Session, host: Host, deadline: float) -> None:
             logging.info(f"Driver not connected to {host} yet")
             return None
         return True
-    await wait_for(cql_ready, deadline, period=0.1)
+    await wait_for(cql_ready, deadline, period=.05, backoff_factor=2, max_period=.2)
 
 
 async def wait_for_cql_and_get_hosts(cql: Session, servers: list[ServerInfo], deadline: float) \
@@ -134,6 +134,9 @@ async def wait_for_cql_and_get_hosts(cql: Session, servers: list[ServerInfo], de
         pred=get_hosts,
         deadline=deadline,
         before_retry=try_refresh_nodes,
+        period=.05,
+        backoff_factor=2,
+        max_period=.2,
     )
 
     # Take only hosts from `ip_set` (there may be more)
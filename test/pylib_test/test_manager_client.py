@@ -0,0 +1,146 @@
+#
+# Copyright (C) 2026-present ScyllaDB
+#
+# SPDX-License-Identifier: LicenseRef-ScyllaDB-Source-Available-1.1
+#
+
+"""Tests for ManagerClient's cache of running servers.
+
+The Manager server is replaced by a stub of RESTClient._fetch, so the
+tests can tell which requests reached it and hold a request in flight.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import pytest
+
+from test.pylib.internal_types import ServerInfo
+from test.pylib.manager_client import ManagerClient
+from test.pylib.rest_client import UnixRESTClient
+
+
+def make_server(server_id: int) -> ServerInfo:
+    ip = f"127.0.0.{server_id}"
+    return ServerInfo(server_id, ip, ip, "dc1", "rack1", 1000 + server_id)
+
+
+class FakeManager:
+    """Answers the Manager requests used by the tests"""
+
+    def __init__(self):
+        self.servers = [make_server(1)]
+        self.requests: list[str] = []
+        self.add_started = asyncio.Event()
+        self.add_release = asyncio.Event()
+        self.add_release.set()
+
+    async def fetch(self, method: str, resource: str, response_type=None, **kwargs):
+        self.requests.append(resource)
+        # Let other tasks run while the request is in flight
+        await asyncio.sleep(0)
+        if resource == "/cluster/running-servers":
+            return [list(srv) for srv in self.servers]
+        if resource == "/cluster/addserver":
+            self.add_started.set()
+            await self.add_release.wait()
+            server = make_server(len(self.servers) + 1)
+            self.servers.append(server)
+            return server.as_dict()
+        if resource == "/cluster/is-dirty":
+            return False
+        if resource.startswith("/cluster/before-test/"):
+            return {"cluster": "fake cluster", "running_servers": [list(srv) for srv in self.servers]}
+        raise AssertionError(f"unexpected request {method} {resource}")
+
+
+class FakeCluster:
+    def connect(self):
+        return object()
+
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def fake_manager(monkeypatch):
+    fake = FakeManager()
+    async def fetch(_client, method, resource, *args, **kwargs):
+        return await fake.fetch(method, resource, *args, **kwargs)
+    monkeypatch.setattr(UnixRESTClient, "_fetch", fetch)
+    return fake
+
+
+@asynccontextmanager
+async def new_manager():
+    manager = ManagerClient("/nonexistent.sock", 9042, False, None, lambda *args: FakeCluster())
+    try:
+        yield manager
+    finally:
+        await manager.stop()
+
+
+async def test_running_servers_cached(fake_manager):
+    async with new_manager() as manager:
+        assert await manager.running_servers() == fake_manager.servers
+        assert await manager.running_servers() == fake_manager.servers
+        assert fake_manager.requests.count("/cluster/running-servers") == 1
+
+
+async def test_running_servers_returns_copy(fake_manager):
+    async with new_manager() as manager:
+        servers = await manager.running_servers()
+        servers.clear()
+        assert await manager.running_servers() == fake_manager.servers
+
+
+async def test_running_servers_after_server_add(fake_manager):
+    async with new_manager() as manager:
+        await manager.running_servers()
+        added = await manager.server_add(connect_driver=False)
+        assert await manager.running_servers() == [make_server(1), added]
+
+
+async def test_running_servers_with_server_add_in_flight(fake_manager):
+    async with new_manager() as manager:
+        fake_manager.add_release.clear()
+        task = asyncio.create_task(manager.server_add(connect_driver=False))
+        await fake_manager.add_started.wait()
+        # The add hasn't finished yet, so the new server isn't running
+        assert await manager.running_servers() == [make_server(1)]
+        fake_manager.add_release.set()
+        added = await task
+        # Finishing the add doesn't send another request, but must still
+        # invalidate the list fetched while it was in flight
+        assert await manager.running_servers() == [make_server(1), added]
+
+
+async def test_concurrent_running_servers(fake_manager):
+    async with new_manager() as manager:
+        first, second = await asyncio.gather(manager.running_servers(), manager.running_servers())
+        assert first == second == fake_manager.servers
+        added = await manager.server_add(connect_driver=False)
+        assert await manager.running_servers() == [make_server(1), added]
+
+
+async def test_running_servers_seeded_by_before_test(fake_manager, tmp_path):
+    async with new_manager() as manager:
+        try:
+            await manager.before_test("test_case", tmp_path / "test_case.log")
+        finally:
+            logging.getLogger().removeHandler(manager.test_log_fh)
+            manager.test_log_fh.close()
+        assert manager.cql is not None
+        # driver_connect() and this call both use the list returned by before-test
+        assert await manager.running_servers() == fake_manager.servers
+        assert "/cluster/running-servers" not in fake_manager.requests
+
+
+async def test_running_servers_after_test_finished(fake_manager):
+    async with new_manager() as manager:
+        await manager.running_servers()
+        manager.test_finished_event.set()
+        with pytest.raises(Exception, match="after_test method was called"):
+            await manager.running_servers()
+        manager.test_finished_event.clear()